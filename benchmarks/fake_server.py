@@ -0,0 +1,128 @@
+"""Local fake of the Anthropic Messages endpoint for offline benchmarks."""
+
+# file handling
+import glob
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+def load_recordings(recordings_dir: str) -> list[dict[str, Any]]:
+    """Load recorded Messages API responses from a directory of JSON files."""
+    recordings: list[dict[str, Any]] = []
+    for path in sorted(glob.glob(os.path.join(recordings_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            recordings.append(json.load(f))
+    if not recordings:
+        raise FileNotFoundError(f"No recorded responses found in {recordings_dir}")
+    return recordings
+
+
+class FakeMessagesServer:
+    """
+    Threaded HTTP server replaying recorded responses on POST /v1/messages,
+    with configurable latency, jitter and error rate.
+    """
+
+    def __init__(
+        self,
+        recordings: list[dict[str, Any]],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.stats = {"requests": 0, "errors": 0}
+
+        self._recordings = itertools.cycle(recordings)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to hand to the Anthropic client (ANTHROPIC_BASE_URL)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeMessagesServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut down the server and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeMessagesServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _next_reply(self) -> tuple[int, dict[str, Any], float]:
+        """Pick the status, body and delay for the next request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency_ms + self._random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+            if self._random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                body = {
+                    "type": "error",
+                    "error": {"type": "overloaded_error", "message": "Overloaded"},
+                }
+                return 529, body, max(delay, 0.0) / 1000
+
+            body = dict(next(self._recordings))
+        body["id"] = f"msg_{uuid.uuid4().hex[:24]}"
+        return 200, body, max(delay, 0.0) / 1000
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                # Drain the request body so the client can reuse the connection
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+
+                if self.path.split("?")[0] != "/v1/messages":
+                    self._send_json(404, {"type": "error", "error": {}})
+                    return
+
+                status, body, delay = server._next_reply()
+                time.sleep(delay)
+                self._send_json(status, body)
+
+            def _send_json(self, status: int, body: dict[str, Any]) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Keep benchmark output free of per-request access logs
+                pass
+
+        return Handler
@@ -0,0 +1,301 @@
+"""
+Offline benchmark scenarios for the extraction pipeline.
+
+Runs `process_image`, `process_dataframe` and `export_data` against synthetic
+batches and a local fake Messages endpoint, reporting throughput, p50/p95
+latency and peak RSS. No network access or API key is needed.
+"""
+
+# file handling
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.fake_server import FakeMessagesServer, load_recordings  # noqa: E402
+from src import custom_logging as clogs  # noqa: E402
+
+SCENARIOS = ("serial", "concurrent", "cache", "dataframe", "export")
+BENCH_PROMPT = "Convert the text in the image to csv."
+
+
+def load_pipeline() -> ModuleType:
+    """Import the pipeline module (`src/pipeline.py`)."""
+    from src import pipeline
+
+    return pipeline
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS counter (VmHWM); False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MiB since the last reset (Linux reports KiB)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Fall back to the lifetime peak when /proc is unavailable
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(
+    name: str, latencies: list[float], wall_time: float, rss_reset: bool
+) -> dict[str, Any]:
+    """Build a result record from per-item latencies (seconds)."""
+    ordered = sorted(latencies)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = ordered[0] if ordered else 0.0
+    return {
+        "scenario": name,
+        "items": len(latencies),
+        "wall_s": round(wall_time, 4),
+        "throughput_per_s": round(len(latencies) / wall_time, 3) if wall_time else 0.0,
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        # False means the figure is the process-wide lifetime peak
+        "peak_rss_per_scenario": rss_reset,
+    }
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Run `func` and return its duration in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_items(
+    name: str, items: list[Any], func: Callable[[Any], Any], workers: int = 1
+) -> dict[str, Any]:
+    """Time `func` over every item, serially or on a thread pool."""
+    rss_reset = reset_peak_rss()
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Copy the log context into each task so batch_id stays attached
+            futures = [
+                clogs.submit_with_context(pool, timed, lambda item=item: func(item))
+                for item in items
+            ]
+            latencies = [future.result() for future in futures]
+    else:
+        latencies = [timed(lambda: func(item)) for item in items]
+    return summarize(name, latencies, time.perf_counter() - start, rss_reset)
+
+
+def load_sg_frame(pipeline: ModuleType, batch_id: str) -> Any:
+    """Load the SG workbook the same way the pipeline does (incl. pre-flight)."""
+    _, _, data_sg, _ = pipeline.setup_processing(batch_id)
+    return data_sg
+
+
+def run_benchmarks(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Generate the synthetic batch, start the fake server and run scenarios."""
+    profile = synthetic.get_size_profiles()[args.size]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="khipu_bench_")
+    batch_id = f"bench_{args.size}"
+    batch = synthetic.write_batch(os.path.join(work_dir, "_data"), args.size, args.year)
+
+    recordings = load_recordings(args.recordings or batch["recordings"])
+    server = FakeMessagesServer(
+        recordings,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    # The SDK reads ANTHROPIC_BASE_URL when the client is constructed
+    os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+    os.environ.setdefault("CLAUDE_API_KEY", "bench-offline-key")
+    os.environ["KHIPU_ROOT"] = work_dir
+
+    results: list[dict[str, Any]] = []
+    with server:
+        pipeline = load_pipeline()
+        clogs.bind_log_context(batch_id=batch_id)
+        # Configure the shared logger first so logs land in the work dir
+        logger = pipeline.clogs.get_logger(os.path.join(work_dir, "logs"))
+        data_sg = load_sg_frame(pipeline, batch_id)
+        logger.setLevel(args.log_level)
+        images = [
+            os.path.join(batch["img"], name)
+            for name in sorted(os.listdir(batch["img"]))
+        ]
+
+        def extract(image_path: str) -> Any:
+            with pipeline.clogs.log_context(image=os.path.basename(image_path)):
+                data_df, _ = pipeline.process_image(
+                    image_path, BENCH_PROMPT, [], args.year, data_sg, logger
+                )
+            return data_df
+
+        if "cache" in args.scenarios:
+            # First pass pays imports, locale setup and client construction
+            results.append(run_items("cache_cold", images[:1], extract))
+            results.append(run_items("cache_warm", images[:1] * 3, extract))
+        if "serial" in args.scenarios:
+            results.append(run_items("extract_serial", images, extract))
+        if "concurrent" in args.scenarios:
+            results.append(
+                run_items(
+                    f"extract_concurrent_x{args.workers}",
+                    images,
+                    extract,
+                    workers=args.workers,
+                )
+            )
+
+        if "dataframe" in args.scenarios or "export" in args.scenarios:
+            import pandas as pd
+
+            parsed = pipeline.postprocessing.parse_csv_string(
+                synthetic.make_page_csv(profile["rows"], args.year)
+            )
+
+            def transform(_: int) -> Any:
+                raw = pd.DataFrame(parsed[1:], columns=parsed[0])
+                return pipeline.process_dataframe(raw, args.year, data_sg, logger)
+
+            pages = list(range(profile["pages"]))
+            if "dataframe" in args.scenarios:
+                results.append(run_items("process_dataframe", pages, transform))
+            if "export" in args.scenarios:
+                frames = [transform(page) for page in pages]
+                # Same store as production, resolved under KHIPU_ROOT=work_dir
+                store_path = pipeline.config.get_store_settings()["path"]
+                results.append(
+                    run_items(
+                        "export_data_xlsx_store",
+                        [frames] * args.repeat,
+                        lambda data_list: pipeline.postprocessing.export_data(
+                            data_list=data_list,
+                            folder_output=batch["output"],
+                            batch_id=batch_id,
+                            store_path=store_path,
+                        ),
+                    )
+                )
+
+    for result in results:
+        result["size"] = args.size
+    results.append({"server": dict(server.stats), "size": args.size})
+    return results
+
+
+def compare_to_baseline(
+    results: list[dict[str, Any]], baseline_path: str, tolerance: float
+) -> list[str]:
+    """Return a message for every scenario whose p95 regressed past tolerance."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["scenario"]: r for r in json.load(f) if "scenario" in r}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.get("scenario", ""))
+        if not previous or not previous["p95_ms"]:
+            continue
+        ratio = result["p95_ms"] / previous["p95_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result['scenario']}: p95 {previous['p95_ms']}ms -> "
+                f"{result['p95_ms']}ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    """Print scenario results as an aligned table."""
+    header = f"{'scenario':<26}{'items':>7}{'thr/s':>10}{'p50 ms':>10}"
+    header += f"{'p95 ms':>10}{'rss MiB':>10}"
+    print(header)
+    print("-" * len(header))
+    lifetime_rss = False
+    for r in results:
+        if "scenario" not in r:
+            print(f"fake server: {r['server']}")
+            continue
+        rss = f"{r['peak_rss_mb']}" + ("" if r["peak_rss_per_scenario"] else "*")
+        lifetime_rss = lifetime_rss or not r["peak_rss_per_scenario"]
+        print(
+            f"{r['scenario']:<26}{r['items']:>7}{r['throughput_per_s']:>10}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{rss:>10}"
+        )
+    if lifetime_rss:
+        print("* process-wide peak RSS (per-scenario reset unsupported)")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline khipu benchmarks.")
+    parser.add_argument(
+        "--size", choices=list(synthetic.get_size_profiles()), default="small"
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=lambda s: s.split(","),
+        default=list(SCENARIOS),
+        help=f"Comma-separated subset of: {','.join(SCENARIOS)}",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--recordings", help="Directory of recorded responses")
+    parser.add_argument("--work-dir", help="Where to write the synthetic batch")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Results JSON to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {sorted(unknown)}")
+        sys.exit(2)
+
+    results = run_benchmarks(args)
+    print_table(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,182 @@
+"""Synthetic batch generators: page images, SG workbooks and API recordings."""
+
+# file handling
+import argparse
+import datetime as dt
+import json
+import os
+import random
+from typing import Any
+
+# Spanish headers as they appear on the handwritten sheets
+DAY_ABBRS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+MONTH_ABBRS = [
+    "Ene",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dic",
+]
+
+
+def get_size_profiles() -> dict[str, dict[str, Any]]:
+    """Returns dictionary of synthetic batch sizes"""
+    return {
+        "small": {"pages": 5, "rows": 20, "image_size": (800, 600)},
+        "medium": {"pages": 20, "rows": 60, "image_size": (1600, 1200)},
+        "large": {"pages": 40, "rows": 200, "image_size": (3200, 2400)},
+    }
+
+
+def animal_ids(n_rows: int, year: int) -> list[str]:
+    """Animal numbers as written on the sheets (dash-separated)."""
+    return [f"{100 + i}-{year % 100}" for i in range(n_rows)]
+
+
+def week_headers(year: int, start: dt.date | None = None) -> list[str]:
+    """Seven consecutive day headers such as 'Ene. Lun. 1'."""
+    start = start or dt.date(year, 1, 1)
+    headers = []
+    for offset in range(7):
+        day = start + dt.timedelta(days=offset)
+        headers.append(
+            f"{MONTH_ABBRS[day.month - 1]}. {DAY_ABBRS[day.weekday()]}. {day.day}"
+        )
+    return headers
+
+
+def make_page_csv(n_rows: int, year: int, seed: int = 0) -> str:
+    """CSV text for one page, shaped like the model's transcription."""
+    rng = random.Random(seed)
+    lines = [",".join(["Vaca", "Nombre", "Becerro", *week_headers(year)])]
+    for animal in animal_ids(n_rows, year):
+        values = []
+        for _ in range(7):
+            kg = f"{rng.uniform(8, 35):.1f}"
+            roll = rng.random()
+            if roll < 0.05:
+                kg = "-"
+            elif roll < 0.15:
+                kg = f"{kg}*"
+            values.append(kg)
+        lines.append(",".join([animal, f"Vaca {animal}", "", *values]))
+    return "\n".join(lines)
+
+
+def make_recorded_message(n_rows: int, year: int, seed: int = 0) -> dict[str, Any]:
+    """Messages API response body wrapping a synthetic page transcription."""
+    csv_text = make_page_csv(n_rows, year, seed)
+    text = (
+        "Confidence threshold used: 90 percent. "
+        "Cells below the threshold are marked with an asterisk.\n"
+        f"[{csv_text}]"
+    )
+    return {
+        "id": f"msg_bench_{seed:04d}",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-6",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1600, "output_tokens": 12 * (n_rows + 1)},
+    }
+
+
+def write_recordings(
+    output_dir: str, n_rows: int, year: int, count: int = 3
+) -> list[str]:
+    """Write `count` recorded responses as JSON files and return their paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for seed in range(count):
+        path = os.path.join(output_dir, f"page_{n_rows}rows_{seed:02d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                make_recorded_message(n_rows, year, seed), f, ensure_ascii=False
+            )
+        paths.append(path)
+    return paths
+
+
+def write_images(
+    output_dir: str, count: int, size: tuple[int, int], seed: int = 0
+) -> list[str]:
+    """Write `count` noisy ruled-sheet JPEGs of the given size."""
+    from PIL import Image, ImageDraw
+
+    os.makedirs(output_dir, exist_ok=True)
+    width, height = size
+    paths = []
+    for idx in range(count):
+        # Noise keeps the JPEG payload close to a real photographed sheet
+        image = Image.effect_noise(size, 40 + idx % 10).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        for y in range(0, height, max(height // 30, 1)):
+            draw.line([(0, y), (width, y)], fill=(20, 20, 20), width=2)
+        for x in range(0, width, max(width // 10, 1)):
+            draw.line([(x, 0), (x, height)], fill=(20, 20, 20), width=2)
+        draw.text((10, 10), f"Vaca  pagina {seed + idx}", fill=(0, 0, 0))
+
+        path = os.path.join(output_dir, f"page_{idx:03d}.jpg")
+        image.save(path, "JPEG", quality=85)
+        paths.append(path)
+    return paths
+
+
+def write_sg_workbook(output_dir: str, n_rows: int, year: int) -> str:
+    """
+    Write a 'Fecha Parto' workbook (title row, then headers) covering
+    roughly 90% of the synthetic animals so the merge leaves some gaps.
+    """
+    from openpyxl import Workbook
+
+    os.makedirs(output_dir, exist_ok=True)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Reporte de partos"])
+    sheet.append(["Número", "Nombre", "F.Últ.Par"])
+    for idx, animal in enumerate(animal_ids(n_rows, year)):
+        if idx % 10 == 9:
+            continue
+        calving = dt.datetime(year - 1, 1 + idx % 12, 1 + idx % 28)
+        sheet.append([animal.replace("-", "/"), f"Vaca {animal}", calving])
+
+    path = os.path.join(output_dir, "Fecha_Parto_bench.xlsx")
+    workbook.save(path)
+    return path
+
+
+def write_batch(root_dir: str, size: str, year: int) -> dict[str, str]:
+    """Lay out a complete synthetic batch in the `_data/<batch_id>` format."""
+    profile = get_size_profiles()[size]
+    batch_base = os.path.join(root_dir, f"bench_{size}")
+    paths = {
+        "img": os.path.join(batch_base, "1_img"),
+        "sg_excel": os.path.join(batch_base, "2_sg_excel"),
+        "output": os.path.join(batch_base, "3_output"),
+        "recordings": os.path.join(batch_base, "recordings"),
+    }
+    write_images(paths["img"], profile["pages"], profile["image_size"])
+    write_sg_workbook(paths["sg_excel"], profile["rows"], year)
+    write_recordings(paths["recordings"], profile["rows"], year)
+    os.makedirs(paths["output"], exist_ok=True)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic batch.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--size", choices=list(get_size_profiles()), default="small")
+    parser.add_argument("--year", type=int, default=dt.date.today().year)
+    args = parser.parse_args()
+
+    for name, path in write_batch(args.output_dir, args.size, args.year).items():
+        print(f"{name}: {path}")
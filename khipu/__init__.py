@@ -0,0 +1 @@
+"""Khipu: dairy farm data extraction from handwritten records."""
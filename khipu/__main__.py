@@ -0,0 +1,7 @@
+"""Entry point for `python -m khipu`."""
+
+import sys
+
+from khipu.cli import main
+
+sys.exit(main())
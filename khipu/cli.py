@@ -0,0 +1,124 @@
+"""
+Command-line interface with `run`, `validate` and `status` subcommands.
+
+Only standard-library and lightweight `src` modules are imported at module
+load; pandas, the Anthropic SDK and dotenv are imported by `run` alone.
+"""
+
+# file handling
+import argparse
+import glob
+import os
+import sys
+
+from src import config, preflight
+from src import custom_logging as clogs
+from src.validation import ValidationError
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Process a batch end to end."""
+    # Heavy imports (pandas, anthropic, dotenv) happen here only
+    from src import pipeline
+
+    pipeline.main(args.batch_id)
+    return 0
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """Run the pre-flight checks without touching pandas or the API."""
+    logger = clogs.get_logger(config.get_base_paths()["logs"])
+    try:
+        batch_paths = config.get_batch_paths(args.batch_id)
+        report = preflight.run_preflight(args.batch_id, batch_paths, logger)
+    except ValidationError as e:
+        print(f"{args.batch_id}: INVALID {e.code} - {e.message}")
+        return 1
+
+    report_path = preflight.write_report(report, batch_paths["output"])
+    for error in report["errors"]:
+        print(f"{error['code']}: {error['message']}")
+    status = "INVALID" if report["errors"] else "OK"
+    print(f"{args.batch_id}: {status} ({len(report['images'])} images)")
+    print(f"Report: {report_path}")
+    return 1 if report["errors"] else 0
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    """Summarize inputs and outputs for one batch or every batch."""
+    data_dir = config.get_base_paths()["data"]
+    if args.batch_id:
+        batch_ids = [args.batch_id]
+    elif os.path.isdir(data_dir):
+        batch_ids = sorted(
+            name
+            for name in os.listdir(data_dir)
+            if os.path.isdir(os.path.join(data_dir, name))
+        )
+    else:
+        batch_ids = []
+
+    if not batch_ids:
+        print(f"No batches found in {data_dir}")
+        return 0
+
+    for batch_id in batch_ids:
+        paths = config.get_batch_paths(batch_id)
+        images = []
+        if os.path.isdir(paths["img"]):
+            images = preflight.list_images(paths["img"])
+        sg_found = os.path.isdir(paths["sg_excel"]) and preflight.find_sg_excel(
+            paths["sg_excel"]
+        )
+        n_outputs = len(glob.glob(os.path.join(paths["output"], "*.xlsx")))
+        print(
+            f"{batch_id}: images={len(images)} "
+            f"sg_excel={'yes' if sg_found else 'missing'} outputs={n_outputs}"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="khipu", description="Dairy farm data extraction."
+    )
+    parser.add_argument(
+        "--root", help="Project root holding _data/ and logs/ (default: KHIPU_ROOT)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Process a batch of images")
+    run_parser.add_argument("batch_id", help="Batch folder name, e.g. 01_2024_4")
+    run_parser.set_defaults(func=cmd_run)
+
+    validate_parser = subparsers.add_parser(
+        "validate", help="Run pre-flight checks without calling the API"
+    )
+    validate_parser.add_argument("batch_id")
+    validate_parser.set_defaults(func=cmd_validate)
+
+    status_parser = subparsers.add_parser("status", help="Show batch status")
+    status_parser.add_argument("batch_id", nargs="?")
+    status_parser.set_defaults(func=cmd_status)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and dispatch to the selected subcommand."""
+    args = build_parser().parse_args(argv)
+    if args.root:
+        os.environ["KHIPU_ROOT"] = os.path.abspath(args.root)
+
+    # Fail fast before any subcommand creates folders in the wrong place
+    try:
+        config.get_base_paths()
+    except ValidationError as e:
+        print(f"{e.code}: {e.message}", file=sys.stderr)
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
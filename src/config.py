@@ -4,10 +4,33 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from src.validation import ValidationError
+
+
+# Project root: parent of the `src` package, overridable via KHIPU_ROOT
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def is_source_checkout(path: str) -> bool:
+    """Returns True if path looks like a source checkout or existing data root"""
+    return any(
+        os.path.exists(os.path.join(path, marker))
+        for marker in ("pyproject.toml", ".git", "_data")
+    )
+
 
 def get_base_paths(root_dir: str | None = None) -> dict[str, str]:
     """Returns dictionary of base paths for project"""
-    base = root_dir or os.path.dirname(os.path.dirname(os.getcwd()))
+    base = root_dir or os.getenv("KHIPU_ROOT")
+    if not base:
+        # A non-editable install puts PROJECT_ROOT in site-packages
+        if not is_source_checkout(PROJECT_ROOT):
+            raise ValidationError(
+                "ROOT_ERROR",
+                f"{PROJECT_ROOT} is not a project checkout; "
+                "set KHIPU_ROOT (or --root) to the folder holding _data/",
+            )
+        base = PROJECT_ROOT
     return {
         "root": base,
         "data": os.path.join(base, "_data"),
@@ -84,6 +107,25 @@ def get_data_settings() -> dict[str, Any]:
     }
 
 
+def get_preflight_settings() -> dict[str, Any]:
+    """Returns pre-flight batch validation settings"""
+    return {
+        "jpeg_magic": b"\xff\xd8\xff",
+        "min_resolution": (800, 600),
+        "hash_chunk_size": 1 << 20,
+        "max_workers": 8,
+        "report_name": "preflight_{batch_id}.json",
+    }
+
+
+def get_store_settings() -> dict[str, Any]:
+    """Returns longitudinal milk store settings"""
+    return {
+        "enabled": True,
+        "path": os.path.join(get_base_paths()["data"], "leche_historico.sqlite"),
+    }
+
+
 def get_df_settings() -> dict[str, Any]:
     """Returns DataFrame operation settings"""
     return {
@@ -98,5 +140,7 @@ def get_logging_config() -> dict[str, Any]:
     return {
         "level": "INFO",
         "format": "%(asctime)s - %(levelname)s - %(message)s",
-        "file": os.path.join(get_base_paths()["logs"], "process.log"),
+        "file_name": "data_processing.log",
+        "rotate_when": "midnight",
+        "backup_count": 30,
     }
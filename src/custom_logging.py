@@ -1,15 +1,110 @@
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future
 from datetime import datetime
 from typing import Any
 
+from src import config
+
+# Structured fields carried on every record (None when not set)
+CONTEXT_FIELDS = ("batch_id", "image", "stage", "duration", "tokens")
+
+# Per-thread/task context; pool workers inherit it via `submit_with_context`
+_log_context: contextvars.ContextVar[dict[str, Any]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+_listener: logging.handlers.QueueListener | None = None
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current log context to records in the emitting thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            # Explicit `extra=` values win over the ambient context
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class SnapshotQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue a rendered snapshot; layout (JSON/text) runs on the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render message and traceback now: args may be mutated after logging
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Add structured fields (batch_id, image, ...) to logs within the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def bind_log_context(**fields: Any) -> None:
+    """Add structured fields to all later logs in the current thread/task."""
+    _log_context.set({**_log_context.get(), **fields})
+
+
+def submit_with_context(
+    pool: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Future[Any]:
+    """Submit `fn` to a pool so it runs with a copy of the caller's log context."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
 
 def setup_logger(
-    log_dir: str = "logs", log_level: int = logging.DEBUG
+    log_dir: str = "logs", log_level: int | str | None = None
 ) -> logging.Logger:
     """
-    Configure and return a logger with both file and console handlers.
+    Configure and return a logger that enqueues records; a background
+    listener writes JSON lines to a daily-rotated file and text to console.
     """
+    global _listener
+    settings = config.get_logging_config()
+    log_level = log_level or settings["level"]
+
     # Create logs directory if it doesn't exist
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -18,35 +113,57 @@ def setup_logger(
     logger = logging.getLogger("data_processor")
     logger.setLevel(log_level)
 
-    # Prevent adding handlers multiple times
-    if not logger.handlers:
-        # File handler - daily rotation
-        log_file = os.path.join(
-            log_dir, f"data_processing_{datetime.now().strftime('%Y%m%d')}.log"
+    # Start one listener; restart cleanly after shutdown_logging()
+    if _listener is None:
+        for handler in list(logger.handlers):
+            if isinstance(handler, SnapshotQueueHandler):
+                logger.removeHandler(handler)
+
+        # File handler - rotates at midnight, JSON lines
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            os.path.join(log_dir, settings["file_name"]),
+            when=settings["rotate_when"],
+            backupCount=settings["backup_count"],
+            encoding="utf-8",
         )
-        file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(log_level)
+        file_handler.setFormatter(JsonFormatter())
 
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
-
-        # Create formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+        console_handler.setFormatter(
+            logging.Formatter(settings["format"], datefmt="%Y-%m-%d %H:%M:%S")
         )
 
-        # Add formatter to handlers
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        # Callers only render and enqueue; layout and I/O run on the listener
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+        queue_handler = SnapshotQueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+        logger.addHandler(queue_handler)
+        logger.propagate = False
 
-        # Add handlers to logger
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        # Re-register so restarts do not stack duplicate exit hooks
+        atexit.unregister(shutdown_logging)
+        atexit.register(shutdown_logging)
 
     return logger
 
 
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and close its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger(log_dir: str = "logs") -> logging.Logger:
     """Get or create a configured logger instance."""
     return setup_logger(log_dir)
@@ -54,12 +171,12 @@ def get_logger(log_dir: str = "logs") -> logging.Logger:
 
 def log_file_processing(logger: logging.Logger, filename: str) -> None:
     """Log the start of processing for a file."""
-    logger.info(f"Processing file: {filename}")
+    logger.info("Processing file: %s", filename)
 
 
 def log_column_status(logger: logging.Logger, status: str, cols: list[str]) -> None:
     """Log column list status and updates."""
-    logger.debug(f"cols_list {status}: {cols}")
+    logger.debug("cols_list %s: %s", status, cols)
 
 
 def log_dataframe_creation(
@@ -69,14 +186,16 @@ def log_dataframe_creation(
     if success:
         logger.info("Dataframe successfully created")
     else:
-        logger.error(f"DataFrame creation failed: {error}")
+        logger.error("DataFrame creation failed: %s", error)
 
 
 def log_dataframe_columns(
-    logger: logging.Logger, df_name: str, columns: list[str]
+    logger: logging.Logger, df_name: str, columns: Iterable[str]
 ) -> None:
     """Log DataFrame columns with context."""
-    logger.debug(f"{df_name} columns: {columns}")
+    # Skip materializing the column list when DEBUG is filtered out
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s columns: %s", df_name, list(columns))
 
 
 def log_process_separator(logger: logging.Logger) -> None:
@@ -84,17 +203,32 @@ def log_process_separator(logger: logging.Logger) -> None:
     logger.debug("---")
 
 
+def log_stage(
+    logger: logging.Logger,
+    stage: str,
+    duration: float,
+    tokens: int | None = None,
+) -> None:
+    """Log completion of a pipeline stage with timing and token usage."""
+    logger.info(
+        "Stage %s finished in %.3fs",
+        stage,
+        duration,
+        extra={"stage": stage, "duration": round(duration, 4), "tokens": tokens},
+    )
+
+
 def log_api_comment(
     logger: logging.Logger, content: str, pre_process: bool = True
 ) -> None:
     """Log AI-API comment output with optional pre-processing."""
     try:
         comment = content.split("[")[0] if pre_process else content
-        logger.info(f"API Comment: {comment.strip()}")
+        logger.info("API Comment: %s", comment.strip())
     except (AttributeError, IndexError) as e:
-        logger.error(f"Failed to process API comment: {str(e)}")
+        logger.error("Failed to process API comment: %s", e)
 
 
 def log_validation_error(logger: logging.Logger, data: list[Any], reason: str) -> None:
     """Log validation errors with context about what failed validation."""
-    logger.error(f"Validation error: {reason}. Data: {data}")
+    logger.error("Validation error: %s. Data: %s", reason, data)
@@ -5,11 +5,17 @@ import datetime as dt
 # date handling
 import locale
 import os
+import threading
 from io import StringIO
 
 # data processing
 import pandas as pd
 
+from src import store
+
+# setlocale is process-wide; serialize the switch-parse-reset sequence
+_locale_lock = threading.Lock()
+
 
 def parse_csv_string(csv_string: str) -> list[list[str]]:
     """Converts a CSV string into a list of lists."""
@@ -35,14 +41,15 @@ def insert_column_name(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
 
 def convert_to_date(date_string: str, year: int) -> str:
     """Converts Spanish date string to formatted date string (d/mm/yyyy)."""
-    # Set Spanish locale for date parsing
-    locale.setlocale(locale.LC_TIME, "es_ES.UTF-8")
-
-    # Parse date string with year
-    date_obj = dt.datetime.strptime(f"{date_string} {year}", "%B %A %d %Y")
-
-    # Reset locale to system default
-    locale.setlocale(locale.LC_TIME, "")
+    with _locale_lock:
+        # Set Spanish locale for date parsing
+        locale.setlocale(locale.LC_TIME, "es_ES.UTF-8")
+        try:
+            # Parse date string with year
+            date_obj = dt.datetime.strptime(f"{date_string} {year}", "%B %A %d %Y")
+        finally:
+            # Reset locale to system default
+            locale.setlocale(locale.LC_TIME, "")
 
     return date_obj.strftime("%-d/%m/%Y")
 
@@ -146,8 +153,11 @@ def export_data(
     folder_output: str,
     batch_id: str,
     base_name: str = "leche",
+    store_path: str | None = None,
 ) -> tuple[str, str]:
-    """Export data to two Excel files with different names."""
+    """
+    Export data to two Excel files with different names and,
+    if `store_path` is given, upsert it into the longitudinal store."""
     # Create regular output file
     regular_filename = create_filename(base_name, batch_id)
     regular_path = save_dataframes_to_excel(
@@ -160,4 +170,8 @@ def export_data(
         dataframes=data_list, output_path=folder_output, filename=final_filename
     )
 
+    # Upsert long-format records into the per-animal store
+    if store_path:
+        store.upsert_records(store_path, data_list, batch_id)
+
     return regular_path, final_path
@@ -0,0 +1,164 @@
+"""Pre-flight batch validation run before any API request is made."""
+
+# file handling
+import glob
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src import config
+from src import custom_logging as clogs
+from src.validation import ValidationError, Validator
+
+
+def list_images(img_dir: str) -> list[str]:
+    """Return sorted image paths in a batch image folder."""
+    patterns = config.get_file_patterns()
+    return [
+        os.path.join(img_dir, filename)
+        for filename in sorted(os.listdir(img_dir))
+        if filename.lower().endswith(patterns["images"])
+    ]
+
+
+def find_sg_excel(sg_dir: str) -> list[str]:
+    """Return SG workbooks matching the configured pattern."""
+    pattern = config.get_file_patterns()["sg_excel"]
+    return sorted(glob.glob(os.path.join(sg_dir, pattern)))
+
+
+def hash_file(file_path: str, chunk_size: int) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_image(
+    validator: Validator, image_path: str, settings: dict[str, Any]
+) -> dict[str, Any]:
+    """Run every image check and return a per-image result record."""
+    result: dict[str, Any] = {"path": image_path, "error": None}
+    try:
+        validator.validate_image(image_path)
+        result["size"] = validator.validate_image_content(
+            image_path, settings["jpeg_magic"], settings["min_resolution"]
+        )
+        result["sha256"] = hash_file(image_path, settings["hash_chunk_size"])
+    except ValidationError as e:
+        result["error"] = {"code": e.code, "message": e.message}
+    except OSError as e:
+        # Unreadable or removed mid-run: record it instead of aborting the report
+        validator.logger.error("Unreadable image %s: %s", image_path, e)
+        result["error"] = {"code": "IMAGE_ERROR", "message": f"{image_path}: {e}"}
+    return result
+
+
+def check_sg_excel(validator: Validator, sg_dir: str) -> dict[str, Any]:
+    """Locate the SG workbook and validate its schema."""
+    columns = config.get_column_settings()
+    header_row = config.get_data_settings()["excel_settings"]["header_row"]
+    result: dict[str, Any] = {"path": None, "error": None}
+    try:
+        matches = find_sg_excel(sg_dir)
+        if not matches:
+            raise ValidationError("SG_EXCEL_ERROR", f"No SG workbook in {sg_dir}")
+        result["path"] = validator.validate_sg_workbook(
+            matches[0],
+            header_row,
+            columns["rename_map"],
+            columns["required_columns"],
+        )
+    except ValidationError as e:
+        result["error"] = {"code": e.code, "message": e.message}
+    return result
+
+
+def run_preflight(
+    batch_id: str, batch_paths: dict[str, str], logger: logging.Logger
+) -> dict[str, Any]:
+    """
+    Validate every image and the SG workbook in parallel and
+    return a report; `report["errors"]` is empty when the batch is valid.
+    """
+    settings = config.get_preflight_settings()
+    validator = Validator(logger)
+    validator.validate_batch_paths(batch_paths)
+
+    images = list_images(batch_paths["img"])
+    # Workers inherit the caller's log context (batch_id) for attribution
+    with ThreadPoolExecutor(max_workers=settings["max_workers"]) as pool:
+        sg_future = clogs.submit_with_context(
+            pool, check_sg_excel, validator, batch_paths["sg_excel"]
+        )
+        image_futures = [
+            clogs.submit_with_context(pool, check_image, validator, path, settings)
+            for path in images
+        ]
+        image_results = [future.result() for future in image_futures]
+        sg_result = sg_future.result()
+
+    errors = [{"path": r["path"], **r["error"]} for r in image_results if r["error"]]
+    if not images:
+        errors.append(
+            {
+                "path": batch_paths["img"],
+                "code": "IMAGE_ERROR",
+                "message": "No images found",
+            }
+        )
+    if sg_result["error"]:
+        errors.append({"path": batch_paths["sg_excel"], **sg_result["error"]})
+
+    # Group identical files: the same page twice would double-count its data
+    by_hash: dict[str, list[str]] = {}
+    for r in image_results:
+        if "sha256" in r:
+            by_hash.setdefault(r["sha256"], []).append(r["path"])
+    duplicates = [paths for paths in by_hash.values() if len(paths) > 1]
+    for paths in duplicates:
+        errors.append(
+            {
+                "path": paths[0],
+                "code": "DUPLICATE_ERROR",
+                "message": f"Identical images: {[os.path.basename(p) for p in paths]}",
+            }
+        )
+
+    report = {
+        "batch_id": batch_id,
+        "images": images,
+        "sg_excel": sg_result["path"],
+        "duplicates": duplicates,
+        "errors": errors,
+    }
+    logger.info(
+        "Pre-flight: %d images checked, %d errors", len(images), len(errors)
+    )
+    return report
+
+
+def write_report(report: dict[str, Any], output_dir: str) -> str:
+    """Write a pre-flight report as JSON and return its path."""
+    name = config.get_preflight_settings()["report_name"]
+    report_path = os.path.join(output_dir, name.format(batch_id=report["batch_id"]))
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report_path
+
+
+def raise_for_errors(report: dict[str, Any]) -> None:
+    """Raise a ValidationError summarizing a failed pre-flight report."""
+    errors = report["errors"]
+    if errors:
+        first = errors[0]
+        raise ValidationError(
+            "PREFLIGHT_ERROR",
+            f"{len(errors)} problem(s) in batch {report['batch_id']}; "
+            f"first: {first['code']} - {first['message']}",
+        )
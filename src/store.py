@@ -0,0 +1,177 @@
+"""Persistent per-animal milk history in long format, backed by SQLite."""
+
+# file handling
+import datetime as dt
+import os
+import sqlite3
+from contextlib import closing
+
+# data processing
+import pandas as pd
+
+from src import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS milk_records (
+    animal TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kg_leche REAL,
+    raw_value TEXT,
+    flagged INTEGER NOT NULL DEFAULT 0,
+    fecha_parto TEXT,
+    batch_id TEXT NOT NULL,
+    page INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (animal, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_milk_records_date ON milk_records (date);
+"""
+
+UPSERT = """
+INSERT INTO milk_records (
+    animal, date, kg_leche, raw_value, flagged,
+    fecha_parto, batch_id, page, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (animal, date) DO UPDATE SET
+    kg_leche = excluded.kg_leche,
+    raw_value = excluded.raw_value,
+    flagged = excluded.flagged,
+    fecha_parto = COALESCE(excluded.fecha_parto, milk_records.fecha_parto),
+    batch_id = excluded.batch_id,
+    page = excluded.page,
+    updated_at = excluded.updated_at
+"""
+
+LONG_COLUMNS = [
+    "animal",
+    "date",
+    "kg_leche",
+    "raw_value",
+    "flagged",
+    "fecha_parto",
+    "batch_id",
+    "page",
+]
+
+
+def connect(store_path: str) -> sqlite3.Connection:
+    """Open the store, creating the schema on first use."""
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(store_path)
+    # WAL lets reports read while a batch is being written
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def to_long_format(df: pd.DataFrame, batch_id: str, page: int) -> pd.DataFrame:
+    """
+    Reshape one processed page (`Fecha N` / `Kg/Leche` column pairs)
+    into one row per (animal, date).
+    """
+    settings = config.get_data_settings()
+    parts = []
+    for idx, col in enumerate(df.columns):
+        # Each `Fecha N` column holds a single date; its value column follows it
+        if not str(col).startswith("Fecha ") or col == "Fecha Parto":
+            continue
+        if idx + 1 >= len(df.columns):
+            continue
+        date_str = df.iloc[0, idx] if len(df) else None
+        if not isinstance(date_str, str):
+            continue
+        date_iso = dt.datetime.strptime(date_str, "%d/%m/%Y").date().isoformat()
+
+        raw = df.iloc[:, idx + 1].astype(str).str.strip()
+        parts.append(
+            pd.DataFrame(
+                {
+                    "animal": df["Número animal"],
+                    "date": date_iso,
+                    "kg_leche": pd.to_numeric(
+                        raw.str.replace("*", "", regex=False), errors="coerce"
+                    ),
+                    "raw_value": raw,
+                    "flagged": raw.str.contains("*", regex=False).astype(int),
+                    "fecha_parto": df["Fecha Parto"].mask(
+                        df["Fecha Parto"] == settings["null_marker"]
+                    ),
+                }
+            )
+        )
+
+    if not parts:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    long_df = pd.concat(parts, ignore_index=True).dropna(subset=["animal"])
+    long_df = long_df[long_df["animal"].astype(str).str.strip() != ""]
+    # Blank cells carry no reading and must not displace an earlier one
+    long_df = long_df.dropna(subset=["kg_leche"])
+    long_df["batch_id"] = batch_id
+    long_df["page"] = page
+    # Repeated pages within a batch: keep the last reading per key
+    return long_df.drop_duplicates(subset=["animal", "date"], keep="last")[
+        LONG_COLUMNS
+    ]
+
+
+def upsert_records(
+    store_path: str, data_list: list[pd.DataFrame], batch_id: str
+) -> int:
+    """Upsert processed pages into the store and return the rows written."""
+    frames = [
+        to_long_format(df, batch_id, page)
+        for page, df in enumerate(data_list, start=1)
+    ]
+    long_df = pd.concat(frames, ignore_index=True).drop_duplicates(
+        subset=["animal", "date"], keep="last"
+    )
+    if long_df.empty:
+        return 0
+
+    # sqlite3 needs None rather than NaN for missing values
+    long_df = long_df.astype(object).where(long_df.notna(), None)
+    updated_at = dt.datetime.now().isoformat(timespec="seconds")
+    rows = [(*row, updated_at) for row in long_df.itertuples(index=False)]
+
+    with closing(connect(store_path)) as conn, conn:
+        conn.executemany(UPSERT, rows)
+    return len(rows)
+
+
+def animal_history(
+    store_path: str,
+    animal: str,
+    days: int = 30,
+    end: dt.date | None = None,
+) -> pd.DataFrame:
+    """Return an animal's records for the `days` days ending on `end`."""
+    end = end or dt.date.today()
+    start = end - dt.timedelta(days=days)
+    with closing(connect(store_path)) as conn:
+        return pd.read_sql_query(
+            "SELECT * FROM milk_records "
+            "WHERE animal = ? AND date > ? AND date <= ? ORDER BY date",
+            conn,
+            params=(animal, start.isoformat(), end.isoformat()),
+        )
+
+
+def herd_daily_totals(
+    store_path: str,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+) -> pd.DataFrame:
+    """Return per-day herd totals (animals recorded, total and flagged kg)."""
+    query = (
+        "SELECT date, COUNT(kg_leche) AS animals, SUM(kg_leche) AS total_kg, "
+        "SUM(CASE WHEN flagged THEN kg_leche ELSE 0 END) AS flagged_kg "
+        "FROM milk_records WHERE date >= ? AND date <= ? "
+        "GROUP BY date ORDER BY date"
+    )
+    params = (
+        (start or dt.date.min).isoformat(),
+        (end or dt.date.max).isoformat(),
+    )
+    with closing(connect(store_path)) as conn:
+        return pd.read_sql_query(query, conn, params=params)
@@ -1,7 +1,10 @@
 import logging
 import os
+from typing import TYPE_CHECKING
 
-import pandas as pd
+# pandas is only needed for annotations; keeps path checks import-light
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ValidationError(Exception):
@@ -37,29 +40,92 @@ class Validator:
         """Validate and return batch processing paths"""
         for path in batch_paths.values():
             if not os.path.exists(path):
-                self.logger.error(f"Directory not found: {path}")
+                self.logger.error("Directory not found: %s", path)
                 raise ValidationError("PATH_ERROR", f"Directory not found: {path}")
         return batch_paths
 
     def validate_image(self, image_path: str) -> str:
         """Validate and return image path"""
         if not os.path.exists(image_path):
-            self.logger.error(f"Image not found: {image_path}")
+            self.logger.error("Image not found: %s", image_path)
             raise ValidationError("IMAGE_ERROR", f"Image not found: {image_path}")
 
         if not image_path.lower().endswith((".jpeg", ".jpg")):
-            self.logger.error(f"Invalid image format: {image_path}")
+            self.logger.error("Invalid image format: %s", image_path)
             raise ValidationError("FORMAT_ERROR", "Invalid image format")
 
         if os.path.getsize(image_path) == 0:
-            self.logger.error(f"Empty image file: {image_path}")
+            self.logger.error("Empty image file: %s", image_path)
             raise ValidationError("EMPTY_ERROR", "Empty image file")
 
         return image_path
 
+    def validate_image_content(
+        self, image_path: str, magic: bytes, min_size: tuple[int, int]
+    ) -> tuple[int, int]:
+        """Validate JPEG signature and resolution; return (width, height)"""
+        from PIL import Image, UnidentifiedImageError
+
+        with open(image_path, "rb") as f:
+            if f.read(len(magic)) != magic:
+                self.logger.error("Not a JPEG file: %s", image_path)
+                raise ValidationError("FORMAT_ERROR", f"Not a JPEG file: {image_path}")
+
+        # Image.open only parses the header; pixel data is never decoded
+        try:
+            with Image.open(image_path) as img:
+                size = img.size
+        except (UnidentifiedImageError, OSError) as e:
+            self.logger.error("Undecodable image %s: %s", image_path, e)
+            raise ValidationError("DECODE_ERROR", f"{image_path}: {e}")
+
+        # Compare short and long sides so portrait and landscape shots match
+        if min(size) < min(min_size) or max(size) < max(min_size):
+            self.logger.error("Resolution too low %s: %s", size, image_path)
+            raise ValidationError(
+                "RESOLUTION_ERROR",
+                f"{image_path}: {size[0]}x{size[1]} below "
+                f"{min_size[0]}x{min_size[1]}",
+            )
+        return size
+
+    def validate_sg_workbook(
+        self,
+        file_path: str,
+        header_row: int,
+        rename_map: dict[str, str],
+        required_cols: list[str],
+    ) -> str:
+        """Validate SG workbook header row without loading the sheet data"""
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(file_path, read_only=True)
+        except Exception as e:
+            self.logger.error("Unreadable workbook %s: %s", file_path, e)
+            raise ValidationError("SG_EXCEL_ERROR", f"{file_path}: {e}")
+
+        try:
+            # First sheet, matching pd.read_excel's default sheet_name=0
+            rows = workbook.worksheets[0].iter_rows(
+                min_row=header_row + 1, max_row=header_row + 1, values_only=True
+            )
+            header = next(rows, ())
+        finally:
+            workbook.close()
+
+        columns = [rename_map.get(str(c), str(c)) for c in header if c is not None]
+        missing = [col for col in required_cols if col not in columns]
+        if missing:
+            self.logger.error("Missing SG columns %s: %s", missing, file_path)
+            raise ValidationError(
+                "COLUMN_ERROR", f"{file_path}: missing columns {missing}"
+            )
+        return file_path
+
     def validate_dataframe(
-        self, df: pd.DataFrame, required_cols: list[str]
-    ) -> pd.DataFrame:
+        self, df: "pd.DataFrame", required_cols: list[str]
+    ) -> "pd.DataFrame":
         """Validate and return DataFrame"""
         if df.empty:
             self.logger.error("Empty DataFrame")
@@ -67,14 +133,14 @@ class Validator:
 
         missing = [col for col in required_cols if col not in df.columns]
         if missing:
-            self.logger.error(f"Missing columns: {missing}")
+            self.logger.error("Missing columns: %s", missing)
             raise ValidationError("COLUMN_ERROR", f"Missing columns: {missing}")
 
         return df
 
     def validate_merge(
-        self, left_df: pd.DataFrame, right_df: pd.DataFrame, on_column: str
-    ) -> pd.DataFrame:
+        self, left_df: "pd.DataFrame", right_df: "pd.DataFrame", on_column: str
+    ) -> "pd.DataFrame":
         """Validate and perform DataFrame merge"""
         # Validate input DataFrames
         self.validate_dataframe(left_df, [on_column])
@@ -89,5 +155,5 @@ class Validator:
                 )
             return result
         except Exception as e:
-            self.logger.error(f"Merge failed: {str(e)}")
+            self.logger.error("Merge failed: %s", e)
             raise ValidationError("MERGE_ERROR", str(e))
@@ -0,0 +1,72 @@
+import datetime as dt
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src import store  # noqa: E402
+
+
+def make_page(rows: list[list[str]]) -> "pd.DataFrame":
+    """Processed page shaped like process_dataframe output."""
+    columns = [
+        "Número animal",
+        "Fecha Parto",
+        "Fecha 1",
+        "Kg/Leche",
+        "Fecha 2",
+        "Kg/Leche",
+        "flag_count",
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_to_long_format_pairs_dates_with_following_values():
+    page = make_page(
+        [
+            ["101/24", "3/02/2023", "1/01/2024", "12.5", "2/01/2024", "13*", 1],
+            ["102/24", "X*", "1/01/2024", "", "2/01/2024", "9", 0],
+            ["  ", "X*", "1/01/2024", "7", "2/01/2024", "8", 0],
+        ]
+    )
+
+    long_df = store.to_long_format(page, "b1", page=1)
+    records = {(r.animal, r.date): r for r in long_df.itertuples(index=False)}
+
+    # Blank reading and blank animal number are dropped
+    assert set(records) == {
+        ("101/24", "2024-01-01"),
+        ("101/24", "2024-01-02"),
+        ("102/24", "2024-01-02"),
+    }
+    assert records[("101/24", "2024-01-01")].kg_leche == 12.5
+    assert records[("101/24", "2024-01-02")].kg_leche == 13.0
+    assert records[("101/24", "2024-01-02")].flagged == 1
+    assert pd.isna(records[("102/24", "2024-01-02")].fecha_parto)
+
+
+def test_upsert_keeps_last_reading_per_key(tmp_path):
+    store_path = str(tmp_path / "leche.sqlite")
+    first = make_page(
+        [["101/24", "3/02/2023", "1/01/2024", "10", "2/01/2024", "11", 0]]
+    )
+    repeat = make_page(
+        [["101/24", "3/02/2023", "1/01/2024", "20", "2/01/2024", "", 0]]
+    )
+    rerun = make_page([["101/24", "X*", "1/01/2024", "", "2/01/2024", "12", 0]])
+
+    # Repeated page within a batch: last reading wins, blanks never do
+    assert store.upsert_records(store_path, [first, repeat], "b1") == 2
+    assert store.upsert_records(store_path, [rerun], "b2") == 1
+
+    history = store.animal_history(
+        store_path, "101/24", days=30, end=dt.date(2024, 1, 31)
+    )
+    assert history["kg_leche"].tolist() == [20.0, 12.0]
+    assert history["batch_id"].tolist() == ["b1", "b2"]
+    assert history["page"].tolist() == [2, 1]
+    # A missing calving date does not erase a stored one
+    assert history["fecha_parto"].tolist() == ["3/02/2023", "3/02/2023"]
+
+    totals = store.herd_daily_totals(store_path)
+    assert totals["total_kg"].tolist() == [20.0, 12.0]